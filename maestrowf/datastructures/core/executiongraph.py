@@ -21,6 +21,8 @@ from maestrowf.utils import create_parentdir, get_duration, \
 
 LOGGER = logging.getLogger(__name__)
 SOURCE = "_source"
+# States from which a record will never transition again.
+TERMINAL_STATES = frozenset({State.FINISHED, State.FAILED, State.CANCELLED})
 
 
 class _StepRecord:
@@ -323,7 +325,7 @@ class ExecutionGraph(DAG, PickleInterface):
     """
 
     def __init__(self, submission_attempts=1, submission_throttle=0,
-                 use_tmp=False, dry_run=False):
+                 use_tmp=False, dry_run=False, check_cycles=True):
         """
         Initialize a new instance of an ExecutionGraph.
 
@@ -333,8 +335,10 @@ class ExecutionGraph(DAG, PickleInterface):
         submissions.
         :param use_tmp: A Boolean value that when set to 'True' designates
         that ExecutionGraph should use temporary files for output.
+        :param check_cycles: A Boolean value that when set to 'False' skips
+        checking for cycles as connections are added.
         """
-        super(ExecutionGraph, self).__init__()
+        super(ExecutionGraph, self).__init__(check_cycles=check_cycles)
         # Member variables for execution.
         self._adapter = None
         self._description = OrderedDict()
@@ -432,6 +436,18 @@ class ExecutionGraph(DAG, PickleInterface):
         self.add_edge(parent, step)
         self._dependencies[step].add(parent)
 
+    def add_connections(self, connections):
+        """
+        Add a collection of connections between steps in the ExecutionGraph.
+
+        :param connections: Iterable of (parent, step) tuples, where step is
+            the dependent step that relies on parent.
+        """
+        connections = list(connections)
+        self.add_edges(connections)
+        for parent, step in connections:
+            self._dependencies[step].add(parent)
+
     def set_adapter(self, adapter):
         """
         Set the adapter used to interface for scheduling tasks.
@@ -941,13 +957,28 @@ class ExecutionGraph(DAG, PickleInterface):
         steps in the ExecutionGraph. Each ExecutionGraph stores the adapter
         used to generate and execute its scripts.
         """
-        # Set up the job list and the map to get back to step names.
+        # Set up the job list and a parallel list of step names to map back
+        # to. Records that have already reached a terminal state are not
+        # polled again.
         joblist = []
-        jobmap = {}
+        steplist = []
+        stale = []
         for step in self.in_progress:
-            jobid = self.values[step].jobid[-1]
-            joblist.append(jobid)
-            jobmap[jobid] = step
+            record = self.values[step]
+            if record.status in TERMINAL_STATES:
+                stale.append(step)
+                continue
+            joblist.append(record.jobid[-1])
+            steplist.append(step)
+
+        # Every terminal transition removes the step from the in progress
+        # set, so a terminal record still in it would otherwise hold onto a
+        # submission slot and keep a cancelled study from completing.
+        if stale:
+            LOGGER.warning(
+                "Steps %s are in a terminal state but still marked in "
+                "progress. Removing them.", stale)
+            self.in_progress.difference_update(stale)
 
         # Grab the adapter from the ScriptAdapterFactory.
         adapter = ScriptAdapterFactory.get_adapter(self._adapter["type"])
@@ -955,8 +986,9 @@ class ExecutionGraph(DAG, PickleInterface):
         # Use the adapter to grab the job statuses.
         retcode, job_status = adapter.check_jobs(joblist)
         # Map the job identifiers back to step names.
-        step_status = {jobmap[jobid]: status
-                       for jobid, status in job_status.items()}
+        step_status = {step: job_status[jobid]
+                       for step, jobid in zip(steplist, joblist)
+                       if jobid in job_status}
 
         # Based on return code, log something different.
         if retcode == JobStatusCode.OK:
@@ -52,6 +52,9 @@ class Combination(object):
     parameters is VALID.
     """
 
+    # Default for instances unpickled from before replacements were cached.
+    _replacements = None
+
     def __init__(self, token="$"):
         """
         Initialize an empty Combination class.
@@ -80,6 +83,8 @@ class Combination(object):
         self._labels = OrderedDict()
         self._names = {}
         self._token = token
+        # Ordered (markup, replacement) pairs used by apply, built on demand.
+        self._replacements = None
 
     def add(self, key, name, value, label):
         """
@@ -106,6 +111,7 @@ class Combination(object):
         var = "{}({}.name)".format(self._token, key)
         logger.debug('Name value: %s = %s', var, name)
         self._names[var] = name
+        self._replacements = None
 
     def __str__(self):
         """
@@ -136,27 +142,28 @@ class Combination(object):
         :param item: String that may contain parameters to be substituted.
         :returns: String equal to item, except with parameters replaced.
         """
-        # Apply the Combination's labels to the item.
-        # These are substrings within item that are represented by the format
-        # <self.token>(<key>.label)
-        for key, value in self._labels.items():
-            item = item.replace(key, str(value))
-
-        # apply the Combination's values to the item.
-        # These are substrings within item that are represented by the format
-        # <self.token>(<key>)
-        for key, value in self._params.items():
-            item = item.replace(key, str(value))
-
-        # Apply the Combination's names to the item.
-        # These are substrings within item that are represented by the format
-        # <self.token>(<key>.name)
-        for key, name in self._names.items():
-            item = item.replace(key, str(name))
+        # Items without the token cannot contain any parameters.
+        if self._token not in item:
+            return item
+
+        if self._replacements is None:
+            # Stringify every replacement once, keeping the order in which
+            # they are applied:
+            # 1. Labels -- <self.token>(<key>.label)
+            # 2. Values -- <self.token>(<key>)
+            # 3. Names  -- <self.token>(<key>.name)
+            self._replacements = tuple(
+                (key, str(value))
+                for table in (self._labels, self._params, self._names)
+                for key, value in table.items()
+            )
 
         # Return the item after the Combination has applied itself to it. The
         # parameter item is simply reused since all we're doing is replacing
         # substrings.
+        for key, value in self._replacements:
+            item = item.replace(key, value)
+
         return item
 
     def get_param_values(self, params):
@@ -369,6 +376,6 @@ class ParameterGenerator:
         for combo in self.get_combinations():
             meta[str(combo)] = {}
             meta[str(combo)]["params"] = combo._params
-            meta[str(combo)]["labels"] = combo._labels
+            meta[str(combo)]["labels"] = dict(combo._labels)
 
         return meta
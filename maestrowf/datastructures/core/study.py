@@ -28,18 +28,25 @@
 ###############################################################################
 
 """Class related to the construction of study campaigns."""
-import copy
+from functools import partial
 from hashlib import md5
 import logging
 import os
 import pickle
 import re
-from types import MethodType
 import yaml
 
+try:
+    # Prefer the libyaml backed implementations when they're available.
+    from yaml import CDumper as Dumper, CSafeDumper as SafeDumper, \
+        CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import Dumper, SafeDumper, SafeLoader
+
 from maestrowf.abstracts import PickleInterface
 from maestrowf.datastructures.dag import DAG
-from maestrowf.utils import apply_function, create_parentdir, make_safe_path
+from maestrowf.utils import apply_function, create_parentdir, \
+    make_safe_name, make_safe_path
 from .executiongraph import ExecutionGraph
 
 LOGGER = logging.getLogger(__name__)
@@ -47,10 +54,21 @@ SOURCE = "_source"
 WSREGEX = re.compile(
     r"\$\(([-!\$%\^&\*\(\)_\+\|~=`{}\[\]:;<>\?,\.\/\w]+)\.workspace\)"
 )
+# Literal suffix of every workspace reference. Strings without it cannot
+# match WSREGEX, so it's used to skip the regular expression scan.
+WSTOKEN = ".workspace)"
 ALL_COMBOS = re.compile(
     r"_\*|\*"
 )
 
+try:
+    # Workspace hashes aren't used for security, which lets md5 skip the
+    # security checks (and work on FIPS enabled systems) in Python 3.9+.
+    WSHASH = partial(md5, usedforsecurity=False)
+    WSHASH(b"")
+except TypeError:
+    WSHASH = md5
+
 
 class StudyStep:
     """
@@ -91,12 +109,69 @@ class StudyStep:
         :param combo: A Combination instance to be applied to a StudyStep.
         :returns: A new StudyStep instance with combo applied to its members.
         """
-        # Create a new StudyStep and populate it with substituted values.
-        tmp = StudyStep()
-        tmp.__dict__ = apply_function(self.__dict__, combo.apply)
+        # Create a new StudyStep and populate it with substituted values. The
+        # members are all replaced, so there's no need to run __init__.
+        tmp = self.__class__.__new__(self.__class__)
+        tmp.__dict__, modified = self._apply_function(combo.apply)
         # Return if the new step is modified and the step itself.
+        return modified, tmp
+
+    def _apply_function(self, func):
+        """
+        Apply a function to the members of the StudyStep.
+
+        This is a specialization of apply_function for the layout of a
+        StudyStep: string members (and string values of 'run') have func
+        applied directly, and only other values are handed to the general
+        recursive walker.
+
+        :param func: Function that takes a string and returns it modified.
+        :returns: A tuple of a dictionary of the StudyStep's members with func
+            applied and True if any of the members changed, False otherwise.
+        """
+        # Track changes while applying func so that callers don't have to
+        # compare the result against the original afterwards. Values func
+        # returned untouched are the same objects, so most checks stop at the
+        # identity test.
+        modified = False
+        members = {}
+        for key, value in self.__dict__.items():
+            if key == "run":
+                run = {}
+                for r_key, r_value in value.items():
+                    if r_value and isinstance(r_value, str):
+                        new_value = func(r_value)
+                    else:
+                        new_value = apply_function(r_value, func)
+                    if not modified and new_value is not r_value:
+                        modified = new_value != r_value
+                    run[r_key] = new_value
+                members[key] = run
+            else:
+                if value and isinstance(value, str):
+                    new_value = func(value)
+                else:
+                    new_value = apply_function(value, func)
+                if not modified and new_value is not value:
+                    modified = new_value != value
+                members[key] = new_value
+
+        return members, modified
 
-        return self.__ne__(tmp), tmp
+    def clone(self):
+        """
+        Create a copy of the StudyStep that can be modified independently.
+
+        A StudyStep only holds strings and a 'run' dictionary of plain values,
+        so copying the instance members and the 'run' dictionary is enough to
+        isolate the copy without the cost of a deep copy.
+
+        :returns: A new StudyStep instance with the same contents as self.
+        """
+        tmp = self.__class__.__new__(self.__class__)
+        tmp.__dict__.update(self.__dict__)
+        tmp.run = dict(self.run)
+        return tmp
 
     @property
     def name(self):
@@ -134,7 +209,16 @@ class StudyStep:
         :param other: Object to compare self to.
         : returns: True if other is equal to self, False otherwise.
         """
+        if other is self:
+            return True
+
         if isinstance(other, self.__class__):
+            # Check the members most likely to differ first so that differing
+            # steps are rejected without comparing every member.
+            if self._name != other._name or \
+                    self.run.get("cmd") != other.run.get("cmd"):
+                return False
+
             # This works because the classes are currently interfaces over
             # internals that are all based on Python builtin classes.
             # NOTE: This method will need to be reworked if something more
@@ -217,8 +301,8 @@ class Study(DAG, PickleInterface):
         # Initialized the DAG so we have those structures to be used.
         super(Study, self).__init__()
 
-        # We want deep copies so that properties don't change out from under
-        # the Sudy data structure.
+        # The environment and parameters are held by reference; the Study only
+        # reads from them, so no copies are made.
         self.environment = studyenv
         self.parameters = parameters
         self._out_path = out_path
@@ -252,8 +336,8 @@ class Study(DAG, PickleInterface):
         # into the Study object.
         if steps:
             for step in steps:
-                # Deep copy because it prevents modifications after the fact.
-                self.add_step(step)
+                # Copy because it prevents modifications after the fact.
+                self.add_step(step.clone())
 
     @property
     def output_path(self):
@@ -274,57 +358,73 @@ class Study(DAG, PickleInterface):
         create_parentdir(path)
         path = os.path.join(path, "env.pkl")
         with open(path, 'wb') as pkl:
-            pickle.dump(self, pkl)
+            pickle.dump(self, pkl, protocol=pickle.HIGHEST_PROTOCOL)
 
-        # Construct other metadata related to study construction.
+        # Construct other metadata related to study construction. Step
+        # workspaces are stored relative to the study workspace and
+        # combination workspaces relative to their step's workspace, so only
+        # the trailing one or two path components are kept.
+        sep = os.path.sep
         _workspaces = {}
+        _combo_workspaces = {}
         for key, value in self.workspaces.items():
-            if key == "_source":
+            if key == SOURCE:
                 _workspaces[key] = value
             elif key in self.step_combos:
-                _workspaces[key] = os.path.split(value)[-1]
+                _workspaces[key] = os.path.basename(value)
             else:
-                _workspaces[key] = \
-                    os.path.sep.join(value.rsplit(os.path.sep)[-2:])
+                _workspaces[key] = _combo_workspaces[key] = \
+                    sep.join(value.rsplit(sep, 2)[-2:])
 
         # Construct relative paths for the combinations and nest them in the
-        # same way as the step combinations dictionary.
+        # same way as the step combinations dictionary. The relative paths
+        # were already computed above, so they are only looked up here.
         _step_combos = {}
         for key, value in self.step_combos.items():
             if key == SOURCE:
                 _step_combos[key] = self.workspaces[key]
             elif not self.used_params[key]:
-                _ws = self.workspaces[key]
-                _step_combos[key] = {key: os.path.split(_ws)[-1]}
+                _step_combos[key] = {key: _workspaces[key]}
             else:
                 _step_combos[key] = {}
                 for combo in value:
-                    _ws = self.workspaces[combo]
-                    _step_combos[key][combo] = \
-                        os.path.sep.join(_ws.rsplit(os.path.sep)[-2:])
+                    _ws = _combo_workspaces.get(combo)
+                    if _ws is None:
+                        _ws = self.workspaces[combo]
+                        _ws = sep.join(_ws.rsplit(sep, 2)[-2:])
+                    _step_combos[key][combo] = _ws
 
         metadata = {
             "dependencies": self.depends,
             "hub_dependencies": self.hub_depends,
             "workspaces": _workspaces,
-            "used_parameters": self.used_params,
+            "used_parameters": {
+                key: set(value) for key, value in self.used_params.items()},
             "step_combinations": _step_combos,
         }
         # Write out the study construction metadata.
-        path = os.path.join(self._meta_path, "metadata.yaml")
-        with open(path, "wb") as metafile:
-            metafile.write(yaml.dump(metadata).encode("utf-8"))
+        self._write_metadata("metadata.yaml", metadata, SafeDumper)
 
-        # Write out parameter metadata.
-        metadata = self.parameters.get_metadata()
-        path = os.path.join(self._meta_path, "parameters.yaml")
-        with open(path, "wb") as metafile:
-            metafile.write(yaml.dump(metadata).encode("utf-8"))
+        # Write out parameter metadata. Parameter values can be of any type
+        # a parameter generator produces (numpy scalars, for example), so
+        # they need the full dumper rather than the safe one.
+        self._write_metadata(
+            "parameters.yaml", self.parameters.get_metadata(), Dumper)
 
         # Write out environment metadata
-        path = os.path.join(self._meta_path, "environment.yaml")
-        with open(path, "wb") as metafile:
-            metafile.write(yaml.dump(os.environ.copy()).encode("utf-8"))
+        self._write_metadata("environment.yaml", os.environ.copy(), SafeDumper)
+
+    def _write_metadata(self, name, metadata, dumper):
+        """
+        Stream a metadata document to a YAML file in the metadata directory.
+
+        :param name: Name of the file to write in the metadata directory.
+        :param metadata: The object to write to the file.
+        :param dumper: The yaml Dumper class able to represent metadata.
+        """
+        path = os.path.join(self._meta_path, name)
+        with open(path, "w", encoding="utf-8") as metafile:
+            yaml.dump(metadata, metafile, Dumper=dumper)
 
     def load_metadata(self):
         """Load metadata for the study."""
@@ -344,7 +444,7 @@ class Study(DAG, PickleInterface):
 
         metapath = os.path.join(self._meta_path, "metadata.yaml")
         with open(metapath, "rb") as metafile:
-            metadata = yaml.load(metafile)
+            metadata = yaml.load(metafile, Loader=SafeLoader)
 
         self.depends = metadata["dependencies"]
         self.hub_depends = metadata["hub_dependencies"]
@@ -369,19 +469,20 @@ class Study(DAG, PickleInterface):
         LOGGER.info(
             "Adding step '%s' to study '%s'...", step.name, self.name)
         # Apply the environment to the incoming step.
-        step.__dict__ = \
-            apply_function(step.__dict__, self.environment.apply_environment)
+        step.__dict__, _ = \
+            step._apply_function(self.environment.apply_environment)
 
         # If the step depends on a prior step, create an edge.
         if "depends" in step.run and step.run["depends"]:
             for dependency in step.run["depends"]:
-                LOGGER.info("{0} is dependent on {1}. Creating edge ("
-                            "{1}, {0})...".format(step.real_name, dependency))
+                LOGGER.info(
+                    "%s is dependent on %s. Creating edge (%s, %s)...",
+                    step.real_name, dependency, dependency, step.real_name)
                 if "*" not in dependency:
                     self.add_edge(dependency, step.real_name)
                 else:
                     self.add_edge(
-                        re.sub(ALL_COMBOS, "", dependency),
+                        ALL_COMBOS.sub("", dependency),
                         step.real_name
                     )
         else:
@@ -481,8 +582,56 @@ class Study(DAG, PickleInterface):
             self.name
         )
 
-        # Topological sorted list of steps.
+        # Topological sorted list of steps. Every step descends from SOURCE,
+        # so SOURCE leads the ordering; add it now and only walk the steps.
         t_sorted = self.topological_sort()
+        LOGGER.info("Encountered '%s'. Adding and continuing.", SOURCE)
+        dag.add_node(SOURCE, None)
+        t_sorted.remove(SOURCE)
+
+        # Bind frequently used lookups locally for the staging loops.
+        values = self.values
+        restart_limit = self._restart_limit
+        hash_ws = self._hash_ws
+        workspaces = self.workspaces
+        used_params = self.used_params
+        all_combos = self.step_combos
+        add_step = dag.add_step
+        add_connections = dag.add_connections
+        # Only build the per-step and per-combination banners when they would
+        # actually be emitted.
+        log_info = LOGGER.isEnabledFor(logging.INFO)
+        log_debug = LOGGER.isEnabledFor(logging.DEBUG)
+
+        def sub_workspaces(text, resolved):
+            # Substitute every workspace reference in a single pass, leaving
+            # any reference that wasn't resolved untouched.
+            return WSREGEX.sub(
+                lambda match: resolved.get(match.group(1), match.group(0)),
+                text
+            )
+
+        # Steps that share a set of used parameters name their combinations
+        # and workspaces, and key their expansions, from the same labels and
+        # values. Cache them by the combination's index and the set of
+        # parameters so each is only built once per combination.
+        combo_params = {}
+
+        def get_combo_params(index, combo, params):
+            key = (index, params)
+            if key not in combo_params:
+                param_str = combo.get_param_string(params)
+                param_values = tuple(combo.get_param_values(params))
+                combo_params[key] = (
+                    param_str,
+                    param_values,
+                    (param_str, tuple(str(v) for _, v in param_values)),
+                )
+            return combo_params[key]
+
+        # Every parameterized step walks the same combinations, so generate
+        # them once for the whole study instead of once per step.
+        combos = list(self.parameters)
 
         # For each step, we need to assess what type of step it is.
         # So far we've seen five types of steps:
@@ -500,48 +649,57 @@ class Study(DAG, PickleInterface):
         # used parameters of the step, and then adding all parameterized
         # combinations of funneled steps.
         for step in t_sorted:
-            LOGGER.info(
-                "\n==================================================\n"
-                "Processing step '%s'\n"
-                "==================================================\n",
-                step
-            )
-            # If we encounter SOURCE, just add it and continue.
-            if step == SOURCE:
-                LOGGER.info("Encountered '%s'. Adding and continuing.", SOURCE)
-                dag.add_node(SOURCE, None)
-                continue
-
+            if log_info:
+                LOGGER.info(
+                    "\n==================================================\n"
+                    "Processing step '%s'\n"
+                    "==================================================\n",
+                    step
+                )
             # We're dealing with an actual step. So we have to:
             # Update our management structures.
-            node = self.values[step]
-            self.hub_depends[step] = set()
-            self.depends[step] = set()
-            self.step_combos[step] = set()
+            node = values[step]
+            run = node.run
+            # Edges for this step are collected and added in a single batch.
+            edges = []
+            cmd = run["cmd"]
+            restart = run["restart"]
+            self.hub_depends[step] = step_hubs = set()
+            self.depends[step] = step_depends = set()
+            all_combos[step] = step_combos = set()
 
             s_params = self.parameters.get_used_parameters(node)
-            p_params = set()    # Used parameters excluding the current step.
-            # Iterate through dependencies to update the p_params
+            # Iterate through dependencies to sort out the hub dependencies.
             LOGGER.debug("\n*** Processing dependencies ***")
-            for parent in node.run["depends"]:
+            for parent in run["depends"]:
                 # If we have a dependency that is parameter independent, add
                 # it to the hub dependency set.
                 if "*" in parent:
                     LOGGER.debug("Found funnel dependency -- %s", parent)
-                    self.hub_depends[step].add(re.sub(ALL_COMBOS, "", parent))
+                    step_hubs.add(ALL_COMBOS.sub("", parent))
                 else:
                     LOGGER.debug("Found dependency -- %s", parent)
-                    # Otherwise, just note the parameters used by the step.
-                    self.depends[step].add(parent)
-                    p_params |= self.used_params[parent]
+                    step_depends.add(parent)
+
+            # Used parameters excluding the current step. Only regular
+            # dependencies pass their parameters on to this step.
+            p_params = set().union(
+                *(used_params[parent] for parent in step_depends))
 
             # Search for workspace matches. These affect the expansion of a
             # node because they may use parameters. These are likely to cause
             # a node to fall into the 'Parameter Dependent' case.
-            used_spaces = re.findall(
-                WSREGEX, "{} {}".format(node.run["cmd"], node.run["restart"]))
+            # Each string is only scanned when it could hold a reference. A
+            # workspace may be referenced more than once; each is only
+            # resolved once, in order of first appearance.
+            used_spaces = {}
+            for text in (cmd, restart):
+                if text and WSTOKEN in text:
+                    used_spaces.update(
+                        dict.fromkeys(WSREGEX.findall(text)))
+            used_spaces = list(used_spaces)
             for ws in used_spaces:
-                if ws not in self.used_params:
+                if ws not in used_params:
                     msg = "Workspace for '{}' is being used before it would" \
                           " be generated.".format(ws)
                     LOGGER.error(msg)
@@ -550,7 +708,7 @@ class Study(DAG, PickleInterface):
                 # We have the case that if we're using a workspace of a step
                 # that is a parameter independent dependency, we can skip it.
                 # The parameters don't affect the combinations.
-                if ws in self.hub_depends[step]:
+                if ws in step_hubs:
                     LOGGER.info(
                         "'%s' parameter independent association found. "
                         "Skipping.", ws)
@@ -558,21 +716,44 @@ class Study(DAG, PickleInterface):
 
                 LOGGER.debug(
                     "Found workspace '%s' using parameters %s",
-                    ws, self.used_params[ws])
-                p_params |= self.used_params[ws]
+                    ws, used_params[ws])
+                p_params |= used_params[ws]
 
             # Total parameters used for this step are the union of each parent
             # and the union of the parameters used by this step.
-            self.used_params[step] = p_params | s_params
+            step_params = frozenset(p_params | s_params)
+            used_params[step] = step_params
 
             # Check for a restart and set the rlimit accordingly.
-            if node.run["restart"]:
-                rlimit = self._restart_limit
-            else:
-                rlimit = 0
+            rlimit = restart_limit if restart else 0
+
+            # Resolve the workspace references used by this step up front.
+            # Funneled and unparameterized workspaces are the same for every
+            # combination, so only parameterized ones need to be looked up
+            # per combination.
+            ws_static = {}
+            ws_params = []
+            for match in used_spaces:
+                LOGGER.info("Workspace found -- %s", match)
+                if match in step_hubs:
+                    # If we're looking at a parameter independent match
+                    # the workspace is the folder that contains all of
+                    # the outputs of all combinations for the step.
+                    ws = make_safe_path(self._out_path, match)
+                    LOGGER.info("Found funnel workspace -- %s", ws)
+                    ws_static[match] = ws
+                elif not used_params[match]:
+                    # If it's not a funneled dependency and the match
+                    # is not parameterized, then the workspace is just
+                    # the unparameterized match.
+                    ws_static[match] = workspaces[match]
+                    LOGGER.info(
+                        "Found unparameterized workspace -- %s", match)
+                else:
+                    ws_params.append((match, used_params[match]))
 
             # 1. The step and all its preceding parents use no parameters.
-            if not self.used_params[step]:
+            if not step_params:
                 LOGGER.info(
                     "\n-------------------------------------------------\n"
                     "Adding step '%s' (No parameters used)\n"
@@ -581,179 +762,210 @@ class Study(DAG, PickleInterface):
                 )
                 # If we're not using any parameters at all, we do:
                 # Copy the step and set to not modified.
-                self.step_combos[step].add(step)
+                step_combos.add(step)
 
-                workspace = make_safe_path(self._out_path, *[step])
-                self.workspaces[step] = workspace
+                workspace = make_safe_path(self._out_path, step)
+                workspaces[step] = workspace
                 LOGGER.debug("Workspace: %s", workspace)
 
                 # NOTE: I don't think it's valid to have a specific workspace
                 # since a step with no parameters operates at the global level.
                 # NOTE: Opting to save the old command for provenence reasons.
-                cmd = node.run["cmd"]
-                r_cmd = node.run["restart"]
+                r_cmd = restart
                 LOGGER.info("Searching for workspaces...\ncmd = %s", cmd)
-                for match in used_spaces:
-                    LOGGER.info("Workspace found -- %s", match)
-                    workspace_var = "$({}.workspace)".format(match)
-                    if match in self.hub_depends[step]:
-                        # If we're looking at a parameter independent match
-                        # the workspace is the folder that contains all of
-                        # the outputs of all combinations for the step.
-                        ws = make_safe_path(self._out_path, *[match])
-                        LOGGER.info("Found funnel workspace -- %s", ws)
-                    else:
-                        ws = self.workspaces[match]
-                    cmd = cmd.replace(workspace_var, ws)
-                    r_cmd = r_cmd.replace(workspace_var, ws)
-                # We have to deepcopy the node, otherwise when we modify it
+                if used_spaces:
+                    cmd = sub_workspaces(cmd, ws_static)
+                    r_cmd = sub_workspaces(r_cmd, ws_static)
+                # We have to copy the node, otherwise when we modify it
                 # here, it's reflected in the ExecutionGraph.
-                node = copy.deepcopy(node)
+                node = node.clone()
                 node.run["cmd"] = cmd
                 node.run["restart"] = r_cmd
                 LOGGER.debug("New cmd = %s", cmd)
                 LOGGER.debug("New restart = %s", r_cmd)
-                dag.add_step(step, node, workspace, rlimit)
+                add_step(step, node, workspace, rlimit)
 
-                if self.depends[step] or self.hub_depends[step]:
+                if step_depends or step_hubs:
                     # So, because we don't have used parameters, we can just
                     # loop over the dependencies and add them.
                     LOGGER.debug("Processing regular dependencies.")
-                    for parent in self.depends[step]:
+                    for parent in step_depends:
                         LOGGER.info("Adding edge (%s, %s)...", parent, step)
-                        dag.add_connection(parent, step)
+                        edges.append((parent, step))
 
                     # We can still have a case where we have steps that do
                     # funnel into this one even though this particular step
                     # is not parameterized.
                     LOGGER.debug("Processing hub dependencies.")
-                    for parent in self.hub_depends[step]:
-                        for item in self.step_combos[parent]:
+                    for parent in step_hubs:
+                        for item in all_combos[parent]:
                             LOGGER.info("Adding edge (%s, %s)...", item, step)
-                            dag.add_connection(item, step)
+                            edges.append((item, step))
                 else:
                     # Otherwise, just add source since we're not dependent.
                     LOGGER.debug("Adding edge (%s, %s)...", SOURCE, step)
-                    dag.add_connection(SOURCE, step)
+                    edges.append((SOURCE, step))
 
             # 2. The step has used parameters.
             else:
-                LOGGER.info(
-                    "\n==================================================\n"
-                    "Expanding step '%s'\n"
-                    "==================================================\n"
-                    "-------- Used Parameters --------\n"
-                    "%s\n"
-                    "---------------------------------",
-                    step, self.used_params[step]
-                )
+                if log_info:
+                    LOGGER.info(
+                        "\n================================================\n"
+                        "Expanding step '%s'\n"
+                        "================================================\n"
+                        "-------- Used Parameters --------\n"
+                        "%s\n"
+                        "---------------------------------",
+                        step, step_params
+                    )
+                # Every combination's workspace lives under the step's own
+                # directory. Names joined to it are sanitized and can't hold
+                # separators, so they're simply appended to the directory and
+                # a separator.
+                step_ws = make_safe_path(self._out_path, step)
+                step_ws = os.path.join(step_ws, "")
+
+                # Applying a combination only substitutes the parameters the
+                # step itself references, so combinations that share their
+                # labels and values produce the same expansion. Keep each
+                # expansion and hand out clones of it.
+                own_params = frozenset(s_params)
+                expansions = {}
+                if not own_params:
+                    # The step only inherits parameters from its parents, so
+                    # no combination changes it and applying one is skipped.
+                    expansions[("", ())] = node
+
+                # Dependencies are the same for every combination, so resolve
+                # each parent's used parameters and the funneled step
+                # combinations once for the step.
+                has_parents = step_depends or step_hubs
+                parents = [
+                    (p, used_params[p]) for p in step_depends]
+                hub_items = [
+                    item
+                    for parent in step_hubs
+                    for item in all_combos[parent]
+                ]
+
                 # Now we iterate over the combinations and expand the step.
-                for combo in self.parameters:
-                    LOGGER.info("\n**********************************\n"
-                                "Combo [%s]\n"
-                                "**********************************",
-                                str(combo))
-                    # Compute this step's combination name and workspace.
+                for index, combo in enumerate(combos):
+                    if log_info:
+                        LOGGER.info("\n**********************************\n"
+                                    "Combo [%s]\n"
+                                    "**********************************",
+                                    combo)
+                    # Compute this step's combination name.
                     nickname = None
-                    combo_str = combo.get_param_string(self.used_params[step])
-                    # We must encode explicitly to utf-8
-                    # combo_str = combo_str.encode("utf-8")
-                    if self._hash_ws:
-                        nickname = md5(combo_str.encode("utf-8")).hexdigest()
-                        workspace = make_safe_path(
-                                        self._out_path,
-                                        *[step, nickname])
-                    else:
-                        workspace = \
-                            make_safe_path(self._out_path, *[step, combo_str])
-                        LOGGER.debug("Workspace: %s", workspace)
-                    combo_str = "{}_{}".format(step, combo_str)
-                    self.workspaces[combo_str] = workspace
+                    param_str, param_values, _ = \
+                        get_combo_params(index, combo, step_params)
+                    combo_str = "{}_{}".format(step, param_str)
 
                     # Check if the step combination has been processed.
-                    if combo_str in self.step_combos:
+                    # Combinations that only differ in parameters this step
+                    # doesn't use map to the same step combination.
+                    if combo_str in step_combos:
                         continue
                     # Add this step to the combinations seen.
-                    self.step_combos[step].add(combo_str)
+                    step_combos.add(combo_str)
 
-                    modified, step_exp = node.apply_parameters(combo)
+                    # Compute the step combination's workspace.
+                    # We must encode explicitly to utf-8
+                    if hash_ws:
+                        nickname = \
+                            WSHASH(param_str.encode("utf-8")).hexdigest()
+                        # Hex digests are always path safe.
+                        workspace = step_ws + nickname
+                    else:
+                        workspace = step_ws + make_safe_name(param_str)
+                        if log_debug:
+                            LOGGER.debug("Workspace: %s", workspace)
+                    workspaces[combo_str] = workspace
+
+                    _, _, expansion_key = \
+                        get_combo_params(index, combo, own_params)
+                    expansion = expansions.get(expansion_key)
+                    if expansion is None:
+                        _, expansion = node.apply_parameters(combo)
+                        expansions[expansion_key] = expansion
+                    step_exp = expansion.clone()
                     step_exp.name = combo_str
                     step_exp.nickname = nickname
 
                     # Substitute workspaces into the combination.
-                    cmd = step_exp.run["cmd"]
-                    r_cmd = step_exp.run["restart"]
-                    LOGGER.info("Searching for workspaces...\ncmd = %s", cmd)
-                    for match in used_spaces:
-                        # Construct the workspace variable.
-                        LOGGER.info("Workspace found -- %s", ws)
-                        workspace_var = "$({}.workspace)".format(match)
-                        if match in self.hub_depends[step]:
-                            # If we're looking at a parameter independent match
-                            # the workspace is the folder that contains all of
-                            # the outputs of all combinations for the step.
-                            ws = make_safe_path(self._out_path, *[match])
-                            LOGGER.info("Found funnel workspace -- %s", ws)
-                        elif not self.used_params[match]:
-                            # If it's not a funneled dependency and the match
-                            # is not parameterized, then the workspace is just
-                            # the unparameterized match.
-                            ws = self.workspaces[match]
-                            LOGGER.info(
-                                "Found unparameterized workspace -- %s", match)
-                        else:
-                            # Otherwise, we're dealing with a combination.
-                            ws = "{}_{}".format(
-                                match,
-                                combo.get_param_string(self.used_params[match])
-                            )
-                            LOGGER.info(
-                                "Found parameterized workspace -- %s", ws)
-                            ws = self.workspaces[ws]
+                    exp_run = step_exp.run
+                    cmd = exp_run["cmd"]
+                    r_cmd = exp_run["restart"]
+                    if log_debug:
+                        LOGGER.debug(
+                            "Searching for workspaces...\ncmd = %s", cmd)
+                    if used_spaces:
+                        resolved = ws_static
+                        if ws_params:
+                            # Add the workspaces of this combination.
+                            resolved = dict(ws_static)
+                            for match, m_params in ws_params:
+                                m_str, _, _ = \
+                                    get_combo_params(index, combo, m_params)
+                                ws = "{}_{}".format(match, m_str)
+                                if log_debug:
+                                    LOGGER.debug(
+                                        "Found parameterized workspace -- %s",
+                                        ws)
+                                resolved[match] = workspaces[ws]
 
                         # Replace in both the command and restart command.
-                        cmd = cmd.replace(workspace_var, ws)
-                        r_cmd = r_cmd.replace(workspace_var, ws)
-                    LOGGER.info("New cmd = %s", cmd)
+                        cmd = sub_workspaces(cmd, resolved)
+                        r_cmd = sub_workspaces(r_cmd, resolved)
+                    if log_debug:
+                        LOGGER.debug("New cmd = %s", cmd)
 
-                    step_exp.run["cmd"] = cmd
-                    step_exp.run["restart"] = r_cmd
+                    exp_run["cmd"] = cmd
+                    exp_run["restart"] = r_cmd
                     # Add to the step to the DAG.
-                    dag.add_step(
-                        step_exp.real_name, step_exp, workspace, rlimit,
-                        params=combo.get_param_values(self.used_params[step]))
+                    add_step(
+                        combo_str, step_exp, workspace, rlimit,
+                        params=param_values)
 
-                    if self.depends[step] or self.hub_depends[step]:
+                    if has_parents:
                         # So, because we don't have used parameters, we can
                         # just loop over the dependencies and add them.
-                        LOGGER.info("Processing regular dependencies.")
-                        for p in self.depends[step]:
-                            if self.used_params[p]:
-                                p = "{}_{}".format(
-                                    p,
-                                    combo.get_param_string(self.used_params[p])
+                        if log_debug:
+                            LOGGER.debug("Processing regular dependencies.")
+                        for p, p_used in parents:
+                            if p_used:
+                                p_str, _, _ = \
+                                    get_combo_params(index, combo, p_used)
+                                p = "{}_{}".format(p, p_str)
+                            if log_debug:
+                                LOGGER.debug(
+                                    "Adding edge (%s, %s)...", p, combo_str
                                 )
-                            LOGGER.info(
-                                "Adding edge (%s, %s)...", p, combo_str
-                            )
-                            dag.add_connection(p, combo_str)
+                            edges.append((p, combo_str))
 
                         # We can still have a case where we have steps that do
                         # funnel into this one even though this particular step
                         # is not parameterized.
-                        LOGGER.debug("Processing hub dependencies.")
-                        for parent in self.hub_depends[step]:
-                            for item in self.step_combos[parent]:
-                                LOGGER.info(
+                        if log_debug:
+                            LOGGER.debug("Processing hub dependencies.")
+                            for item in hub_items:
+                                LOGGER.debug(
                                     "Adding edge (%s, %s)...", item, combo_str
                                 )
-                                dag.add_connection(item, combo_str)
+                        edges.extend((item, combo_str) for item in hub_items)
                     else:
                         # Otherwise, just add source since we're not dependent.
-                        LOGGER.debug(
-                            "Adding edge (%s, %s)...", SOURCE, combo_str
-                        )
-                        dag.add_connection(SOURCE, combo_str)
+                        if log_debug:
+                            LOGGER.debug(
+                                "Adding edge (%s, %s)...", SOURCE, combo_str
+                            )
+                        edges.append((SOURCE, combo_str))
+
+                LOGGER.info(
+                    "Staged %d combinations for step '%s'.",
+                    len(step_combos), step)
+
+            add_connections(edges)
 
         return dag
 
@@ -768,13 +980,15 @@ class Study(DAG, PickleInterface):
         # For each step in the Study
         # Walk the study and add the steps to the ExecutionGraph.
         t_sorted = self.topological_sort()
+        values = self.values
+        restart_limit = self._restart_limit
+        add_step = dag.add_step
+        edges = []
+        # SOURCE leads the ordering since every step descends from it.
+        LOGGER.debug("Source node found.")
+        dag.add_node(SOURCE, None)
+        t_sorted.remove(SOURCE)
         for step in t_sorted:
-            # If we find the source node, we can just add it and continue.
-            if step == SOURCE:
-                LOGGER.debug("Source node found.")
-                dag.add_node(SOURCE, None)
-                continue
-
             # Initialize management structures.
             ws = make_safe_path(self._out_path, *[step])
             self.workspaces[step] = ws
@@ -782,20 +996,22 @@ class Study(DAG, PickleInterface):
             # Hub dependencies are not possible in linear studies. Empty set
             # for completion.
             self.hub_depends[step] = set()
-            self.used_params[step] = set()
+            self.used_params[step] = frozenset()
             self.step_combos[step] = set([step])
 
-            node = self.values[step]
+            node = values[step]
+            run = node.run
+            depends = run["depends"]
             # If the step has a restart cmd, set the limit.
-            if node.run["restart"]:
-                rlimit = self._restart_limit
-            else:
-                rlimit = 0
+            r_cmd = run["restart"]
+            rlimit = restart_limit if r_cmd else 0
 
-            cmd = node.run["cmd"]
-            r_cmd = node.run["restart"]
+            cmd = run["cmd"]
             LOGGER.info("Searching for workspaces...\ncmd = %s", cmd)
-            used_spaces = re.findall(WSREGEX, cmd)
+            if WSTOKEN in cmd:
+                used_spaces = list(dict.fromkeys(WSREGEX.findall(cmd)))
+            else:
+                used_spaces = []
             for match in used_spaces:
                 # In this case we don't need to look for any parameters, or
                 # combination dependent ("funnel") steps. It's a simple sub.
@@ -804,23 +1020,25 @@ class Study(DAG, PickleInterface):
                 ws = self.workspaces[match]
                 cmd = cmd.replace(workspace_var, ws)
                 r_cmd = r_cmd.replace(workspace_var, ws)
-            node.run["cmd"] = cmd
-            node.run["restart"] = r_cmd
+            run["cmd"] = cmd
+            run["restart"] = r_cmd
 
             # Add the step
-            dag.add_step(step, node, ws, rlimit)
+            add_step(step, node, ws, rlimit)
             # If the node does not depend on any other steps, make it so that
             # if connects to SOURCE.
-            if not node.run["depends"]:
-                dag.add_connection(SOURCE, step)
+            if not depends:
+                edges.append((SOURCE, step))
             else:
                 # In this case, since our step names are not parameterized,
                 # and due to topological sort, we can guarantee that our
                 # dependencies have been added. Go through and add each edge.
-                for parent in node.run["depends"]:
+                for parent in depends:
                     self.depends[step].add(parent)
-                    dag.add_connection(parent, step)
+                    edges.append((parent, step))
 
+        # All of the steps have been added, so add every edge in one batch.
+        dag.add_connections(edges)
         return dag
 
     def stage(self):
@@ -868,20 +1086,16 @@ class Study(DAG, PickleInterface):
         # the appropriate fashion.
 
         # Construct ExecutionGraph
+        # Because we're working within a Study class whose steps have already
+        # been verified to not contain a cycle, we can skip the check for
+        # the execution graph. Because the execution graph is constructed from
+        # the study steps, it won't contain a cycle.
         dag = ExecutionGraph(
             submission_attempts=self._submission_attempts,
             submission_throttle=self._submission_throttle,
-            use_tmp=self._use_tmp, dry_run=self._dry_run)
+            use_tmp=self._use_tmp, dry_run=self._dry_run,
+            check_cycles=False)
         dag.add_description(**self.description)
         dag.log_description()
 
-        # Because we're working within a Study class whose steps have already
-        # been verified to not contain a cycle, we can override the check for
-        # the execution graph. Because the execution graph is constructed from
-        # the study steps, it won't contain a cycle.
-        def _pass_detect_cycle(self):
-            pass
-
-        dag.detect_cycle = MethodType(_pass_detect_cycle, dag)
-
         return self._out_path, self._stage(dag)
@@ -55,6 +55,9 @@ class StudyEnvironment:
         # Private members
         self._tokens = set()
         self._names = set()
+        # Every reference to an environment item starts with "<token>(",
+        # so items without any of these can skip substitution entirely.
+        self._prefixes = set()
         # Boolean that tracks if dependencies have been acquired.
         self._is_set_up = False
 
@@ -95,6 +98,7 @@ class StudyEnvironment:
             self.dependencies[item.name] = item
             name = item.name
             self._is_set_up = False
+            self._prefixes.add("{}(".format(item.token))
         elif isinstance(item, Substitution):
             LOGGER.debug("Value: %s", item.value)
             LOGGER.debug("Tokens: %s", self._tokens)
@@ -108,6 +112,7 @@ class StudyEnvironment:
             else:
                 self._tokens.add(item.token)
                 self.substitutions[item.name] = item
+            self._prefixes.add("{}(".format(item.token))
         elif isinstance(item, Source):
             LOGGER.debug("Adding source %s", item.source)
             LOGGER.debug("Item source: %s", item.source)
@@ -205,6 +210,10 @@ class StudyEnvironment:
         if not item:
             return item
 
+        # Nothing in the environment can be referenced by the item.
+        if not any(prefix in item for prefix in self._prefixes):
+            return item
+
         LOGGER.debug("Applying environment to %s", item)
         LOGGER.debug("Processing labels...")
         for label, value in self.labels.items():
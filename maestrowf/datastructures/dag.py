@@ -45,10 +45,23 @@ class DAG(Graph):
     index the values (or objects) at each node.
     """
 
-    def __init__(self):
-        """Initialize the DAG data structure internals."""
+    # Defaults for instances unpickled from before cycle checks could be
+    # disabled and before topological orderings were cached.
+    _check_cycles = True
+    _topo_order = None
+
+    def __init__(self, check_cycles=True):
+        """
+        Initialize the DAG data structure internals.
+
+        :param check_cycles: If True, check the DAG for cycles as edges are
+            added. Only disable this when the edges are known to be acyclic.
+        """
         self.adjacency_table = OrderedDict()
         self.values = OrderedDict()
+        self._check_cycles = check_cycles
+        # Cached topological ordering, reset whenever the graph changes.
+        self._topo_order = None
 
     def add_node(self, name, obj):
         """
@@ -66,6 +79,7 @@ class DAG(Graph):
         logger.debug("Node %s added. Value is of type %s.", name, type(obj))
         self.values[name] = obj
         self.adjacency_table[name] = []
+        self._topo_order = None
 
     def add_edge(self, src, dest):
         """
@@ -74,12 +88,47 @@ class DAG(Graph):
         :param src: Source vertex name.
         :param dest: Destination vertex name.
         """
+        # Check to make sure we've not created a cycle.
+        if (
+                self._add_edge(src, dest) and
+                self._check_cycles and self.detect_cycle()):
+            msg = "Adding edge ({}, {}) crates a cycle.".format(src, dest)
+            logger.error(msg)
+            raise Exception(msg)
+
+    def add_edges(self, edges):
+        """
+        Add a collection of edges to the DAG.
+
+        Each edge is validated as it would be by add_edge, but the DAG is only
+        checked for cycles once after all of the edges have been added.
+
+        :param edges: Iterable of (src, dest) vertex name tuples.
+        """
+        added = False
+        for src, dest in edges:
+            added = self._add_edge(src, dest) or added
+
+        # Check to make sure we've not created a cycle.
+        if added and self._check_cycles and self.detect_cycle():
+            msg = "Adding edges to the DAG creates a cycle."
+            logger.error(msg)
+            raise Exception(msg)
+
+    def _add_edge(self, src, dest):
+        """
+        Validate and add the edge (src, dest) without checking for cycles.
+
+        :param src: Source vertex name.
+        :param dest: Destination vertex name.
+        :returns: True if the edge was added, False otherwise.
+        """
         # Disallow loops to the same node.
         if src == dest:
             msg = "Cannot add self referring cycle edge ({}, {})" \
                   .format(src, dest)
             logger.error(msg)
-            return
+            return False
 
         # Disallow adding edges to the graph before nodes are added.
         error = "Attempted to create edge ({src}, {dest}), but node {node}" \
@@ -91,21 +140,17 @@ class DAG(Graph):
 
         if dest not in self.adjacency_table:
             logger.error(error, src, dest, dest)
-            return
+            return False
 
         if dest in self.adjacency_table[src]:
             logger.debug("Edge (%s, %s) already in DAG. Returning.", src, dest)
-            return
+            return False
 
         # If dest is not already and edge from src, add it.
         self.adjacency_table[src].append(dest)
+        self._topo_order = None
         logging.debug("Edge (%s, %s) added.", src, dest)
-
-        # Check to make sure we've not created a cycle.
-        if self.detect_cycle():
-            msg = "Adding edge ({}, {}) crates a cycle.".format(src, dest)
-            logger.error(msg)
-            raise Exception(msg)
+        return True
 
     def remove_edge(self, src, dest):
         """
@@ -126,6 +171,7 @@ class DAG(Graph):
 
         logging.debug("Removing edge (%s, %s).", src, dest)
         self.adjacency_table[src].remove(dest)
+        self._topo_order = None
 
     def dfs_subtree(self, src, par=None):
         """
@@ -195,8 +241,13 @@ class DAG(Graph):
         """
         Perform a topological ordering of the vertices in the DAG.
 
+        The ordering is cached until a node or edge is added or removed.
+
         :returns: A list of the vertices sorted in topological order.
         """
+        if self._topo_order is not None:
+            return list(self._topo_order)
+
         v_stack = deque()
         v_visited = {key: False for key in self.values.keys()}
 
@@ -204,6 +255,7 @@ class DAG(Graph):
             if not v_visited[v]:
                 self._topological_sort(v, v_visited, v_stack)
 
+        self._topo_order = tuple(v_stack)
         return list(v_stack)
 
     def detect_cycle(self):
@@ -115,9 +115,10 @@ class GitDependency(Dependency):
             raise ValueError(error)
 
         path = os.path.join(self.path, self.name)
-        logger.debug("%s: %s", self.get_var(),
-                     data.replace(self.get_var(), path))
-        return data.replace(self.get_var(), path)
+        var = self.get_var()
+        data = data.replace(var, path)
+        logger.debug("%s: %s", var, data)
+        return data
 
     def acquire(self, substitutions=None):
         """
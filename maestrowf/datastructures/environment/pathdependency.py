@@ -89,9 +89,10 @@ class PathDependency(Dependency):
             logger.exception(error)
             raise ValueError(error)
 
-        logger.debug("%s: %s", self.get_var(),
-                     data.replace(self.get_var(), self.value))
-        return data.replace(self.get_var(), self.value)
+        var = self.get_var()
+        data = data.replace(var, self.value)
+        logger.debug("%s: %s", var, data)
+        return data
 
     def acquire(self, substitutions=None):
         """
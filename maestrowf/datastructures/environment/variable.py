@@ -85,9 +85,10 @@ class Variable(Substitution):
         """
         self._verification("Attempting to substitute a variable that is not"
                            " complete.")
-        logger.debug("%s: %s", self.get_var(),
-                     data.replace(self.get_var(), str(self.value)))
-        return data.replace(self.get_var(), str(self.value))
+        var = self.get_var()
+        data = data.replace(var, str(self.value))
+        logger.debug("%s: %s", var, data)
+        return data
 
     def _verify(self):
         """
@@ -135,8 +135,9 @@ class LocalScriptAdapter(ScriptAdapter):
         LOGGER.debug("Script to execute: %s", path)
         p = start_process(path, shell=False, cwd=cwd, env=env)
         pid = p.pid
+        # communicate() waits on the process, so the return code is set.
         output, err = p.communicate()
-        retcode = p.wait()
+        retcode = p.returncode
 
         o_path = os.path.join(cwd, "{}.{}.out".format(step.name, pid))
         e_path = os.path.join(cwd, "{}.{}.err".format(step.name, pid))
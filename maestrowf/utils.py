@@ -46,6 +46,20 @@ from packaging.version import Version, InvalidVersion
 
 LOGGER = logging.getLogger(__name__)
 
+
+class _SafePathTable(dict):
+    """Translation table that drops any character it does not map."""
+
+    def __missing__(self, key):
+        return None
+
+
+# Characters allowed in path components; spaces are swapped for underscores.
+_SAFE_PATH_TABLE = _SafePathTable(
+    (ord(c), c) for c in
+    "-_.(){}{}".format(string.ascii_letters, string.digits))
+_SAFE_PATH_TABLE[ord(" ")] = "_"
+
 _SEMVER_REGEX = re.compile(r"""^(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<build>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$""")
 
 
@@ -123,11 +137,15 @@ def create_parentdir(path):
 
     :param path: Path to a directory to be created.
     """
-    if not os.path.exists(path):
-        LOGGER.info("Directory does not exist. Creating directories to %s",
-                    path)
-        path = os.path.expanduser(path)
+    path = os.path.expanduser(path)
+    try:
+        # Attempt the creation directly rather than checking for the path
+        # first; it saves a filesystem round trip for every new directory.
         os.makedirs(path)
+    except FileExistsError:
+        return
+
+    LOGGER.info("Directory does not exist. Created directories to %s", path)
 
 
 def apply_function(item, func):
@@ -143,15 +161,20 @@ def apply_function(item, func):
     elif isinstance(item, str):
         return func(item)
     elif isinstance(item, list):
-        return [apply_function(x, func) for x in item]
+        # Strings are the common case, so apply func to them directly rather
+        # than recursing for every element.
+        return [
+            func(x) if x and isinstance(x, str) else apply_function(x, func)
+            for x in item]
     elif isinstance(item, dict):
         return {
-            key: apply_function(value, func) for key, value in item.items()}
+            key:
+                func(value) if value and isinstance(value, str)
+                else apply_function(value, func)
+            for key, value in item.items()}
     else:
-        msg = \
-            "Encountered an object of type '{}'. Passing." \
-            .format(type(item))
-        LOGGER.debug(msg)
+        LOGGER.debug("Encountered an object of type '%s'. Passing.",
+                     type(item))
         return item
 
 
@@ -192,6 +215,16 @@ def csvtable_to_dict(fstream):
     return table
 
 
+def make_safe_name(name):
+    """
+    Construct a path safe version of a single path component.
+
+    :params name: The path component to make safe.
+    :returns: The name with invalid characters stripped.
+    """
+    return name.translate(_SAFE_PATH_TABLE)
+
+
 def make_safe_path(base_path, *args):
     """
     Construct a subpath that is path safe.
@@ -200,13 +233,8 @@ def make_safe_path(base_path, *args):
     :params args: Path components to join into a path.
     :returns: A joined subpath with invalid characters stripped.
     """
-    valid = "-_.() {}{}".format(string.ascii_letters, string.digits)
-    path = [base_path]
-    for arg in args:
-        arg = "".join(c for c in arg if c in valid)
-        arg = arg.replace(" ", "_")
-        path.append(arg)
-    return os.path.join(*path)
+    return os.path.join(
+        base_path, *(arg.translate(_SAFE_PATH_TABLE) for arg in args))
 
 
 def start_process(cmd, cwd=None, env=None, shell=True):
@@ -0,0 +1,75 @@
+import pytest
+
+from maestrowf.datastructures.dag import DAG
+
+
+def _make_dag(names):
+    dag = DAG()
+    for name in names:
+        dag.add_node(name, None)
+    return dag
+
+
+def test_topological_sort_cache_invalidated():
+    dag = _make_dag(["a", "b", "c"])
+    dag.add_edge("a", "b")
+    dag.add_edge("b", "c")
+
+    order = dag.topological_sort()
+    assert order == ["a", "b", "c"]
+    # Mutating the returned list must not affect the cached ordering.
+    order.reverse()
+    assert dag.topological_sort() == ["a", "b", "c"]
+
+    dag.remove_edge("b", "c")
+    dag.add_edge("c", "b")
+    order = dag.topological_sort()
+    assert order.index("a") < order.index("b")
+    assert order.index("c") < order.index("b")
+
+    dag.add_node("d", None)
+    dag.add_edge("d", "a")
+    assert dag.topological_sort()[0] == "d"
+
+
+def test_add_edges():
+    dag = _make_dag(["a", "b", "c"])
+    dag.add_edges([("a", "b"), ("a", "c"), ("a", "b"), ("b", "b")])
+    assert dag.adjacency_table == {"a": ["b", "c"], "b": [], "c": []}
+
+    with pytest.raises(ValueError):
+        dag.add_edges([("missing", "a")])
+
+    with pytest.raises(Exception):
+        dag.add_edges([("b", "c"), ("c", "a")])
+
+
+def test_add_edge_without_cycle_check():
+    dag = _make_dag(["a", "b"])
+    dag.add_edge("a", "b")
+    with pytest.raises(Exception):
+        dag.add_edge("b", "a")
+
+    dag = DAG(check_cycles=False)
+    for name in ("a", "b"):
+        dag.add_node(name, None)
+    dag.add_edge("a", "b")
+    dag.add_edge("b", "a")
+    assert dag.detect_cycle()
+
+
+def test_unpickled_dag_checks_cycles():
+    # DAGs pickled before cycle checks could be disabled lack the member.
+    dag = _make_dag(["a", "b"])
+    del dag.__dict__["_check_cycles"]
+    dag.add_edge("a", "b")
+    with pytest.raises(Exception):
+        dag.add_edge("b", "a")
+
+
+def test_unpickled_dag_topological_sort():
+    # DAGs pickled before orderings were cached lack the member.
+    dag = _make_dag(["a", "b"])
+    dag.add_edge("b", "a")
+    del dag.__dict__["_topo_order"]
+    assert dag.topological_sort() == ["b", "a"]
@@ -0,0 +1,90 @@
+"""Tests for the ExecutionGraph status checking logic."""
+from maestrowf.abstracts.enums import JobStatusCode, State, StudyStatus
+from maestrowf.datastructures.core import StudyStep
+from maestrowf.datastructures.core import executiongraph
+from maestrowf.datastructures.core.executiongraph import ExecutionGraph
+
+
+class _RecordingAdapter:
+    """Adapter stub that records the job lists it is asked about."""
+
+    queried = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def check_jobs(self, joblist):
+        _RecordingAdapter.queried.append(joblist)
+        return JobStatusCode.OK, {jobid: State.RUNNING for jobid in joblist}
+
+
+def _make_graph(tmpdir, names, **kwargs):
+    dag = ExecutionGraph(**kwargs)
+    dag._adapter = {"type": "stub"}
+    for name in names:
+        step = StudyStep()
+        step.name = name
+        dag.add_step(name, step, str(tmpdir.join(name)), 0)
+    return dag
+
+
+def test_check_study_status_skips_terminal(tmpdir, monkeypatch):
+    """Records already in a terminal state should not be polled."""
+    monkeypatch.setattr(
+        executiongraph.ScriptAdapterFactory, "get_adapter",
+        lambda key: _RecordingAdapter)
+    _RecordingAdapter.queried = []
+
+    dag = _make_graph(tmpdir, ["a", "b", "c"])
+    for i, name in enumerate(["a", "b", "c"]):
+        dag.values[name].jobid.append(str(i))
+        dag.in_progress.add(name)
+    dag.values["b"].status = State.FINISHED
+
+    retcode, step_status = dag.check_study_status()
+
+    assert retcode == JobStatusCode.OK
+    assert sorted(_RecordingAdapter.queried[0]) == ["0", "2"]
+    assert step_status == {"a": State.RUNNING, "c": State.RUNNING}
+    # The terminal record no longer counts as in progress.
+    assert dag.in_progress == {"a", "c"}
+
+
+def _make_stale_graph(tmpdir, monkeypatch, **kwargs):
+    """Build a graph whose only in progress step already finished."""
+    monkeypatch.setattr(
+        executiongraph.ScriptAdapterFactory, "get_adapter",
+        lambda key: _RecordingAdapter)
+    _RecordingAdapter.queried = []
+
+    dag = _make_graph(tmpdir, ["a", "b"], **kwargs)
+    dag.values["a"].jobid.append("0")
+    dag.values["a"].status = State.FINISHED
+    dag.in_progress.add("a")
+
+    launched = []
+    monkeypatch.setattr(
+        dag, "_execute_record",
+        lambda record, adapter: launched.append(record.name))
+    return dag, launched
+
+
+def test_stale_in_progress_frees_throttle(tmpdir, monkeypatch):
+    """A terminal record left in progress should not hold a throttle slot."""
+    dag, launched = _make_stale_graph(
+        tmpdir, monkeypatch, submission_throttle=1)
+
+    dag.execute_ready_steps()
+
+    assert "a" not in dag.in_progress
+    assert launched == ["b"]
+
+
+def test_stale_in_progress_completes_cancel(tmpdir, monkeypatch):
+    """A cancelled study should complete despite a stale in progress step."""
+    dag, launched = _make_stale_graph(tmpdir, monkeypatch)
+    dag.is_canceled = True
+
+    assert dag.execute_ready_steps() == StudyStatus.CANCELLED
+    assert not dag.in_progress
+    assert not launched
@@ -0,0 +1,23 @@
+from maestrowf.datastructures.core.parameters import Combination
+
+
+def test_combination_apply():
+    combo = Combination()
+    combo.add("SIZE", "size", 10, "SIZE.10")
+
+    assert combo.apply("no parameters here") == "no parameters here"
+    assert combo.apply("run -n $(SIZE) > $(SIZE.label).$(SIZE.name)") == \
+        "run -n 10 > SIZE.10.size"
+
+    # Parameters added after a previous apply are still substituted.
+    combo.add("ITER", "iter", 2, "ITER.2")
+    assert combo.apply("$(SIZE) $(ITER)") == "10 2"
+
+
+def test_unpickled_combination_apply():
+    # Combinations pickled before replacements were cached lack the member.
+    combo = Combination()
+    combo.add("SIZE", "size", 10, "SIZE.10")
+    del combo.__dict__["_replacements"]
+
+    assert combo.apply("run -n $(SIZE)") == "run -n 10"
@@ -0,0 +1,96 @@
+"""Tests for the StudyStep and Study data structures."""
+import os
+
+import yaml
+
+from maestrowf.datastructures.core import ParameterGenerator, Study, \
+    StudyEnvironment, StudyStep
+from maestrowf.datastructures.core.parameters import Combination
+from maestrowf.datastructures.environment import Variable
+
+
+def _make_step(name="step", cmd="echo $(PARAM)"):
+    step = StudyStep()
+    step.name = name
+    step.description = "A test step."
+    step.run["cmd"] = cmd
+    step.run["depends"] = []
+    return step
+
+
+def _make_combo(key="PARAM", value=10):
+    combo = Combination()
+    combo.add(key, key, value, "{}.{}".format(key, value))
+    return combo
+
+
+def test_studystep_clone_is_independent():
+    """Modifying a clone should not leak back into the original step."""
+    step = _make_step()
+    clone = step.clone()
+
+    assert clone == step
+    assert clone is not step
+    assert clone.run is not step.run
+
+    clone.name = "other"
+    clone.run["cmd"] = "echo changed"
+
+    assert step.name == "step"
+    assert step.run["cmd"] == "echo $(PARAM)"
+
+
+def test_apply_parameters_substitutes_run():
+    """Parameters are substituted into the run block of a new step."""
+    step = _make_step()
+    step.run["depends"] = ["parent"]
+    step.run["nodes"] = 2
+
+    modified, step_exp = step.apply_parameters(_make_combo())
+
+    assert modified
+    assert step_exp is not step
+    assert step_exp.run["cmd"] == "echo 10"
+    assert step_exp.run["depends"] == ["parent"]
+    assert step_exp.run["nodes"] == 2
+    assert step.run["cmd"] == "echo $(PARAM)"
+
+
+def test_apply_parameters_unmodified():
+    """Steps that do not reference the parameters are reported unmodified."""
+    step = _make_step(cmd="echo nothing")
+
+    modified, step_exp = step.apply_parameters(_make_combo())
+
+    assert not modified
+    assert step_exp == step
+
+
+def test_apply_environment():
+    """Environment references are substituted and other items pass as is."""
+    env = StudyEnvironment()
+    env.add(Variable("OUT", "/tmp/out"))
+    env.add(Variable("LOG", "$(OUT)/log"))
+
+    assert env.apply_environment("cat $(LOG)") == "cat /tmp/out/log"
+    item = "echo (no variables)"
+    assert env.apply_environment(item) is item
+
+
+class _Float(float):
+    """A float subclass like the scalars numpy based generators produce."""
+
+
+def test_store_metadata_parameter_subclass(tmp_path):
+    """Parameter values that subclass builtins are written to metadata."""
+    params = ParameterGenerator()
+    params.add_parameter("PARAM", [_Float(1.5), _Float(2.5)], "PARAM.%%")
+    study = Study("study", "A test study.", studyenv=StudyEnvironment(),
+                  parameters=params, out_path=str(tmp_path))
+
+    study.store_metadata()
+
+    with open(os.path.join(str(tmp_path), "meta", "parameters.yaml")) as f:
+        metadata = yaml.load(f, Loader=yaml.Loader)
+    assert metadata["PARAM.1.5"]["params"] == {"$(PARAM)": 1.5}
+    assert metadata["PARAM.2.5"]["labels"] == {"$(PARAM.label)": "PARAM.2.5"}
@@ -3,7 +3,8 @@ from contextlib import nullcontext as does_not_raise
 import pytest
 from pytest import raises
 from rich.pretty import pprint
-from maestrowf.utils import parse_version
+from maestrowf.utils import apply_function, make_safe_name, make_safe_path, \
+    parse_version
 from packaging.version import Version, InvalidVersion
 
 
@@ -58,3 +59,42 @@ def test_version_greater(test_version_string, ref_version, expected, base_expect
 
     ver_cmp_base = test_version.base_version >= ref_version.base_version
     assert ver_cmp_base == base_expected
+
+
+@pytest.mark.parametrize(
+    "base_path, args, expected",
+    [
+        ("/out", ["step"], "/out/step"),
+        ("/out", ["step", "PARAM.1.SIZE.10"], "/out/step/PARAM.1.SIZE.10"),
+        ("/out", ["my step"], "/out/my_step"),
+        ("/out", ["a/b:c*d"], "/out/abcd"),
+        ("/out", ["caf\u00e9 (v2)"], "/out/caf_(v2)"),
+        ("/out", [], "/out"),
+    ],
+)
+def test_make_safe_path(base_path, args, expected):
+    """
+    Test that path components are stripped of unsafe characters and that
+    spaces are replaced with underscores.
+    """
+    assert make_safe_path(base_path, *args) == expected
+    assert make_safe_path(base_path, *map(make_safe_name, args)) == expected
+
+
+def test_apply_function():
+    item = {
+        "cmd": "echo $(VAR)",
+        "depends": ["a_$(VAR)", "", 1],
+        "nested": {"value": "$(VAR)", "count": 2, "empty": ""},
+        "flag": True,
+    }
+    result = apply_function(item, lambda x: x.replace("$(VAR)", "x"))
+
+    assert result == {
+        "cmd": "echo x",
+        "depends": ["a_x", "", 1],
+        "nested": {"value": "x", "count": 2, "empty": ""},
+        "flag": True,
+    }
+    # The original item is left unmodified.
+    assert item["nested"]["value"] == "$(VAR)"